@@ -0,0 +1,102 @@
+"""Pacote único de recursos (assets.pak) para o executável
+
+As imagens são gravadas já decodificadas (pixels RGBA), então a inicialização
+não precisa abrir nem descompactar dezenas de PNGs; os sons vão como WAV.
+A música continua em music/, porque o pygame a lê em streaming do arquivo.
+
+Formato:
+    b'NEMOPAK1' | tamanho do índice (uint32) | índice JSON | dados
+
+Uso para gerar o pacote:
+    python asset_pack.py [assets.pak]
+"""
+
+import json
+import os
+import struct
+import sys
+
+PACK_MAGIC = b'NEMOPAK1'
+PACK_HEADER = struct.Struct('<8sI')
+PACK_NAME = 'assets.pak'
+
+IMAGE_EXTENSIONS = ('.png', '.gif', '.jpg', '.jpeg', '.bmp')
+SOUND_EXTENSIONS = ('.wav', '.ogg', '.oga')
+
+
+def build_pack(root, output_path):
+    """Gera o pacote a partir das pastas images/ e sounds/ em `root`"""
+    import pygame
+
+    index = {'images': {}, 'sounds': {}}
+    blobs = []
+    offset = 0
+
+    def add_blob(data):
+        nonlocal offset
+        blobs.append(data)
+        entry = [offset, len(data)]
+        offset += len(data)
+        return entry
+
+    images_dir = os.path.join(root, 'images')
+    for filename in sorted(os.listdir(images_dir)):
+        name, extension = os.path.splitext(filename)
+        if extension.lower() in IMAGE_EXTENSIONS:
+            surface = pygame.image.load(os.path.join(images_dir, filename))
+            pixels = pygame.image.tobytes(surface, 'RGBA')
+            index['images'][name] = add_blob(pixels) + list(surface.get_size())
+
+    sounds_dir = os.path.join(root, 'sounds')
+    for filename in sorted(os.listdir(sounds_dir)):
+        name, extension = os.path.splitext(filename)
+        if extension.lower() in SOUND_EXTENSIONS:
+            with open(os.path.join(sounds_dir, filename), 'rb') as f:
+                index['sounds'][name] = add_blob(f.read())
+
+    index_blob = json.dumps(index, sort_keys=True, separators=(',', ':')).encode()
+    with open(output_path, 'wb') as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, len(index_blob)))
+        f.write(index_blob)
+        for blob in blobs:
+            f.write(blob)
+
+
+def install_pack(path):
+    """Preenche os caches dos loaders do PgZero com o conteúdo do pacote
+
+    Precisa ser chamado depois de pygame.display.set_mode (convert_alpha).
+    Os loaders encontram os recursos no cache e nunca procuram os arquivos.
+    """
+    import io
+
+    import pygame
+    from pgzero import loaders
+
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    magic, index_size = PACK_HEADER.unpack_from(data, 0)
+    if magic != PACK_MAGIC:
+        raise ValueError(f"{path} não é um pacote de recursos válido")
+
+    start = PACK_HEADER.size + index_size
+    index = json.loads(data[PACK_HEADER.size:start])
+    view = memoryview(data)
+
+    for name, (offset, length, width, height) in index['images'].items():
+        pixels = view[start + offset:start + offset + length]
+        surface = pygame.image.frombuffer(pixels, (width, height), 'RGBA').convert_alpha()
+        loaders.images.cache[loaders.images.cache_key(name, (), {})] = surface
+
+    if pygame.mixer.get_init():
+        for name, (offset, length) in index['sounds'].items():
+            sound_file = io.BytesIO(view[start + offset:start + offset + length])
+            loaders.sounds.cache[loaders.sounds.cache_key(name, (), {})] = pygame.mixer.Sound(sound_file)
+
+
+if __name__ == '__main__':
+    game_root = os.path.dirname(os.path.abspath(__file__))
+    output = sys.argv[1] if len(sys.argv) > 1 else os.path.join(game_root, PACK_NAME)
+    build_pack(game_root, output)
+    print(f"Wrote {output} ({os.path.getsize(output) / 1024:.1f} KiB)")
@@ -0,0 +1,16 @@
+#!/bin/sh
+# Build reproduzível do executável para Linux (saída em dist/nemo/nemo)
+set -e
+
+cd "$(dirname "$0")"
+
+# Mesmas entradas geram os mesmos arquivos
+export PYTHONHASHSEED=0
+export SOURCE_DATE_EPOCH="${SOURCE_DATE_EPOCH:-$(git log -1 --format=%ct 2>/dev/null || echo 0)}"
+
+python -m pip install -r requirements.txt
+python asset_pack.py assets.pak
+python -m PyInstaller --clean --noconfirm nemo.spec
+
+# Falha o build se a inicialização até o menu ficar lenta
+python coldstart_check.py --headless dist/nemo/nemo
@@ -0,0 +1,59 @@
+"""Mede o tempo de inicialização até o primeiro quadro do menu
+
+Roda o jogo várias vezes com NEMO_COLDSTART_PROBE=1 (o jogo fecha depois do
+primeiro quadro) e falha se a mediana passar do limite.
+
+Uso:
+    python coldstart_check.py dist/nemo/nemo        # executável gerado
+    python coldstart_check.py                       # python run_game.py
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from run_game import COLDSTART_PROBE_ENV
+
+
+def measure(command, runs, headless):
+    env = dict(os.environ)
+    env[COLDSTART_PROBE_ENV] = '1'
+    if headless:
+        env.setdefault('SDL_VIDEODRIVER', 'dummy')
+        env.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            sys.exit(f"{' '.join(command)} failed:\n{result.stderr.decode(errors='replace')}")
+        timings.append(elapsed)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check cold start time to the first menu frame")
+    parser.add_argument('command', nargs='*', help="game command (default: python run_game.py)")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=2.0, help="limit for the median")
+    parser.add_argument('--headless', action='store_true', help="use dummy SDL video/audio drivers")
+    args = parser.parse_args()
+
+    command = args.command or [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            'run_game.py')]
+    timings = measure(command, args.runs, args.headless)
+
+    median = statistics.median(timings)
+    print(f"cold start: median {median:.3f} s, min {min(timings):.3f} s, max {max(timings):.3f} s "
+          f"over {args.runs} runs")
+    if median > args.max_seconds:
+        sys.exit(f"cold start exceeds {args.max_seconds:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
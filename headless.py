@@ -0,0 +1,48 @@
+"""Carrega o jogo sem janela nem áudio, para ferramentas de benchmark e testes de carga"""
+
+import os
+import sys
+import types
+
+GAME_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+
+
+def load_game_module(path=GAME_PATH, mute=True):
+    """Executa main.py como o pgzrun faria, mas com drivers de vídeo e áudio falsos
+
+    Retorna o módulo do jogo já com `screen` configurado no tamanho da janela,
+    de forma que game.update_game(dt) e game.draw_game(module.screen) funcionem
+    fora do laço principal do PgZero.
+    """
+    if 'main' in sys.modules and hasattr(sys.modules['main'], 'game'):
+        return sys.modules['main']
+
+    # Os drivers precisam ser definidos antes do pygame.init() feito pelo runner
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    import pygame
+    import pgzero.game
+    from pgzero import runner
+    from pgzero.screen import Screen
+
+    with open(path) as f:
+        src = f.read()
+
+    module = types.ModuleType('main')
+    module.__file__ = path
+    sys.modules['main'] = module
+
+    runner.prepare_mod(module)
+    exec(compile(src, os.path.basename(path), 'exec', dont_inherit=True), module.__dict__)
+
+    # Mesmo papel do PGZeroGame.reinit_screen
+    surface = pygame.display.set_mode((module.WIDTH, module.HEIGHT))
+    pgzero.game.screen = surface
+    module.screen = Screen(surface)
+
+    if mute:
+        module.game.sound_manager.music_enabled = False
+        module.game.sound_manager.sounds_enabled = False
+
+    return module
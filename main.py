@@ -1,11 +1,15 @@
 import math
 import random
+import struct
+import sys
 
 from pgzero import music
 from pgzero.actor import Actor
 from pgzero.loaders import sounds
 from pygame import Rect
 
+import telemetry
+
 # Constantes do jogo
 GRID_SIZE = 32
 WIDTH = 800
@@ -22,6 +26,45 @@ DIRECTION_DOWN = (0, 1)
 DIRECTION_LEFT = (-1, 0)
 DIRECTION_RIGHT = (1, 0)
 
+# Tabelas de índices usadas na serialização compacta dos snapshots
+DIRECTIONS = (DIRECTION_UP, DIRECTION_DOWN, DIRECTION_LEFT, DIRECTION_RIGHT)
+NO_DIRECTION = 255
+SHARK_TYPES = ('reef_shark', 'bull_shark', 'great_white', 'hammer_shark')
+SEAWEED_TYPES = ('kelp', 'coral', 'anemone')
+
+# Direções horizontais (o nado oscila na vertical) e nomes usados nas imagens do Nemo
+HORIZONTAL_DIRECTIONS = (DIRECTION_LEFT, DIRECTION_RIGHT)
+DIRECTION_NAMES = {
+    DIRECTION_RIGHT: 'right',
+    DIRECTION_LEFT: 'left',
+    DIRECTION_UP: 'up',
+    DIRECTION_DOWN: 'down'
+}
+
+# Ângulo de cada direção para rotacionar os tubarões
+DIRECTION_ANGLES = {
+    DIRECTION_RIGHT: 0,
+    DIRECTION_DOWN: 90,
+    DIRECTION_LEFT: 180,
+    DIRECTION_UP: 270
+}
+
+# Separação entre tubarões: distância mínima desejada (pixels) e velocidade do afastamento
+# (acima da velocidade do tubarão mais rápido, para vencer a perseguição ao Nemo)
+SEPARATION_RADIUS = GRID_SIZE
+SEPARATION_SPEED = 45
+
+# Formato binário dos snapshots (little-endian, sem padding)
+SNAPSHOT_MAGIC = b'NEMO'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<4sBBddddddHHH')
+HERO_STATE = struct.Struct('<hhddddh?BBdddB')
+ENEMY_STATE = struct.Struct('<Bhhdddddd?BdBddhhH?dd')
+POWERUP_STATE = struct.Struct('<hhdddddB')
+SEAWEED_LAYOUT = struct.Struct('<BBB')
+SEAWEED_STATE = struct.Struct('<dB')
+RNG_STATE = struct.Struct('<625I?d')
+
 # Contador global (para não usar time)
 global_timer = 0
 
@@ -79,10 +122,40 @@ class SoundManager:
         sounds.ambient_bubble.play()
 
 
+class SpatialGrid:
+    """Grade uniforme para achar vizinhos próximos sem comparar todos os pares"""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def rebuild(self, sprites):
+        """Distribui os sprites nas células pela posição real (uma vez por quadro)"""
+        self.cells = {}
+        for index, sprite in enumerate(sprites):
+            sprite.grid_index = index  # Ordem estável para desempatar sobreposições
+            key = (int(sprite.real_x // self.cell_size), int(sprite.real_y // self.cell_size))
+            bucket = self.cells.get(key)
+            if bucket is None:
+                self.cells[key] = [sprite]
+            else:
+                bucket.append(sprite)
+
+    def neighbors(self, x, y):
+        """Sprites das 9 células em volta da posição (x, y) em pixels"""
+        cell_x = int(x // self.cell_size)
+        cell_y = int(y // self.cell_size)
+        for grid_x in (cell_x - 1, cell_x, cell_x + 1):
+            for grid_y in (cell_y - 1, cell_y, cell_y + 1):
+                bucket = self.cells.get((grid_x, grid_y))
+                if bucket:
+                    yield from bucket
+
+
 class AnimatedSprite:
     """Classe base para sprites animados com dois quadros de animação"""
 
-    def __init__(self, x, y, image_base_name, animation_speed=0.5):
+    def __init__(self, x, y, image_base_name, animation_speed=0.5, sprites_enabled=True):
         self.grid_x = x
         self.grid_y = y
         self.pixel_x = x * GRID_SIZE
@@ -98,21 +171,28 @@ class AnimatedSprite:
         self.animation_timer = 0
         self.current_frame = 0  # 0 ou 1
 
-        # Cria atores para ambos os quadros
-        self.actors = []
-        self.actors.append(Actor(f"{image_base_name}_1"))
-        self.actors.append(Actor(f"{image_base_name}_2"))
+        # Cria atores para ambos os quadros (sprites_enabled=False nas simulações sem desenho)
+        self.sprites_enabled = sprites_enabled
+        self.actors = [None, None]
+        if sprites_enabled:
+            self.actors = [Actor(f"{image_base_name}_1"), Actor(f"{image_base_name}_2")]
 
-        self.update_actor_position()
+        # Posiciona os dois quadros uma vez; depois só o quadro visível é atualizado
+        for actor in self.actors:
+            if actor:
+                actor.pos = (self.pixel_x + GRID_SIZE // 2, self.pixel_y + GRID_SIZE // 2)
 
     def update(self, dt):
         # Atualiza a animação do sprite (alterna entre dois quadros)
+        frame_changed = False
         self.animation_timer += dt
         if self.animation_timer >= self.animation_speed:
             self.animation_timer = 0
             self.current_frame = 1 - self.current_frame  # Alterna entre 0 e 1
+            frame_changed = True
 
         # Atualiza o movimento da posição
+        moved = self.moving
         if self.moving:
             dx = self.target_x - self.pixel_x
             dy = self.target_y - self.pixel_y
@@ -126,13 +206,15 @@ class AnimatedSprite:
                 self.pixel_x += (dx / distance) * self.move_speed
                 self.pixel_y += (dy / distance) * self.move_speed
 
-        self.update_actor_position()
+        # Sprites parados (algas) só precisam reposicionar quando o quadro muda
+        if moved or frame_changed:
+            self.update_actor_position()
 
     def update_actor_position(self):
-        """Atualiza a posição do ator"""
-        for actor in self.actors:
-            if actor:
-                actor.pos = (self.pixel_x + GRID_SIZE // 2, self.pixel_y + GRID_SIZE // 2)
+        """Atualiza a posição do ator do quadro visível"""
+        actor = self.actors[self.current_frame]
+        if actor:
+            actor.pos = (self.pixel_x + GRID_SIZE // 2, self.pixel_y + GRID_SIZE // 2)
 
     def move_to(self, grid_x, grid_y):
         if not self.moving:
@@ -150,8 +232,9 @@ class AnimatedSprite:
 
 
 class Hero(AnimatedSprite):
-    def __init__(self, x, y):
+    def __init__(self, x, y, sprites_enabled=True):
         # Não chama super().__init__ porque precisa de tratamento personalizado para os sprites
+        self.sprites_enabled = sprites_enabled
         self.grid_x = x
         self.grid_y = y
         self.pixel_x = x * GRID_SIZE
@@ -182,18 +265,24 @@ class Hero(AnimatedSprite):
         self.animation_timer = 0
         self.current_frame = 0  # 0 ou 1
 
-        # Cria atores para cada direção (2 quadros cada)
+        # Cria atores para cada direção (2 quadros cada), indexados pela própria direção
         self.direction_actors = {}
-        directions = ['right', 'left', 'up', 'down']
 
-        for direction in directions:
+        for direction, direction_name in DIRECTION_NAMES.items():
+            if not sprites_enabled:
+                self.direction_actors[direction] = [None, None]
+                continue
             try:
-                actor1 = Actor(f"nemo_{direction}_1")
-                actor2 = Actor(f"nemo_{direction}_2")
+                actor1 = Actor(f"nemo_{direction_name}_1")
+                actor2 = Actor(f"nemo_{direction_name}_2")
                 self.direction_actors[direction] = [actor1, actor2]
             except:
                 self.direction_actors[direction] = [None, None]
 
+        # Ator visível (direção e quadro atuais); só ele é posicionado a cada quadro
+        self.active_actor = None
+        self.update_actor_positions()
+
     def update(self, dt, dungeon, sound_manager):
         if not self.alive:
             return
@@ -243,7 +332,7 @@ class Hero(AnimatedSprite):
         swim_offset_x = 0
         swim_offset_y = 0
 
-        if self.current_direction in [DIRECTION_LEFT, DIRECTION_RIGHT]:
+        if self.current_direction in HORIZONTAL_DIRECTIONS:
             swim_offset_y = math.sin(self.swim_timer * self.swim_frequency) * self.swim_amplitude
         else:
             swim_offset_x = math.sin(self.swim_timer * self.swim_frequency) * self.swim_amplitude
@@ -256,38 +345,57 @@ class Hero(AnimatedSprite):
         self.update_actor_positions()
 
     def update_actor_positions(self):
-        """Atualiza todas as posições dos atores"""
-        for direction_actors in self.direction_actors.values():
-            for actor in direction_actors:
-                if actor:
-                    actor.pos = (self.pixel_x + GRID_SIZE // 2, self.pixel_y + GRID_SIZE // 2)
+        """Seleciona o ator da direção e quadro atuais e posiciona só ele"""
+        self.active_actor = self.direction_actors[self.current_direction][self.current_frame]
+        if self.active_actor:
+            self.active_actor.pos = (self.pixel_x + GRID_SIZE // 2, self.pixel_y + GRID_SIZE // 2)
 
     def change_direction(self, new_direction):
         """Muda a direção do movimento contínuo"""
         self.next_direction = new_direction
 
-    def draw(self, screen):
-        """Desenha o Nemo com a direção e quadro de animação atuais"""
-        direction_map = {
-            DIRECTION_RIGHT: 'right',
-            DIRECTION_LEFT: 'left',
-            DIRECTION_UP: 'up',
-            DIRECTION_DOWN: 'down'
-        }
-        direction_name = direction_map.get(self.current_direction, 'right')
+    def snapshot_state(self):
+        """Retorna o estado do Nemo em formato binário (HERO_STATE)"""
+        next_direction = NO_DIRECTION
+        if self.next_direction:
+            next_direction = DIRECTIONS.index(self.next_direction)
+
+        return HERO_STATE.pack(
+            self.grid_x, self.grid_y,
+            self.real_x, self.real_y, self.pixel_x, self.pixel_y,
+            self.health, self.alive,
+            DIRECTIONS.index(self.current_direction), next_direction,
+            self.swim_timer, self.bubble_sound_timer, self.animation_timer,
+            self.current_frame
+        )
 
-        current_actors = self.direction_actors.get(direction_name, [None, None])
-        current_actor = current_actors[self.current_frame]
+    def restore_state(self, blob, offset):
+        """Restaura o estado salvo por snapshot_state sem recriar os atores"""
+        (self.grid_x, self.grid_y,
+         self.real_x, self.real_y, self.pixel_x, self.pixel_y,
+         self.health, self.alive,
+         direction, next_direction,
+         self.swim_timer, self.bubble_sound_timer, self.animation_timer,
+         self.current_frame) = HERO_STATE.unpack_from(blob, offset)
 
-        if current_actor:
-            current_actor.draw()
+        self.current_direction = DIRECTIONS[direction]
+        self.next_direction = None
+        if next_direction != NO_DIRECTION:
+            self.next_direction = DIRECTIONS[next_direction]
+
+        self.update_actor_positions()
+
+    def draw(self, screen):
+        """Desenha o Nemo com a direção e quadro de animação atuais"""
+        if self.active_actor:
+            self.active_actor.draw()
 
 
 class Enemy(AnimatedSprite):
     """Tubarões com animação de sprite de dois quadros"""
 
-    def __init__(self, x, y, enemy_type='reef_shark'):
-        super().__init__(x, y, enemy_type, 0.6)  # Animação mais lenta para tubarões
+    def __init__(self, x, y, enemy_type='reef_shark', sprites_enabled=True):
+        super().__init__(x, y, enemy_type, 0.6, sprites_enabled)  # Animação mais lenta para tubarões
         self.enemy_type = enemy_type
 
         # Define o tamanho com base no tipo de tubarão
@@ -318,14 +426,14 @@ class Enemy(AnimatedSprite):
         # Movimento fluido
         self.real_x = float(x * GRID_SIZE)
         self.real_y = float(y * GRID_SIZE)
-        self.current_direction = random.choice([DIRECTION_UP, DIRECTION_DOWN, DIRECTION_LEFT, DIRECTION_RIGHT])
+        self.current_direction = random.choice(DIRECTIONS)
 
         # Animação de natação
         self.swim_timer = 0
         self.swim_amplitude = 1
         self.swim_frequency = 4
 
-    def update(self, dt, dungeon, hero_pos):
+    def update(self, dt, dungeon, hero_pos, shark_grid=None):
         # Atualiza a animação do sprite
         super().update(dt)
 
@@ -378,7 +486,7 @@ class Enemy(AnimatedSprite):
                     new_direction = DIRECTION_DOWN if dy > 0 else DIRECTION_UP
             else:
                 # Comportamento normal de patrulha
-                directions = [DIRECTION_UP, DIRECTION_DOWN, DIRECTION_LEFT, DIRECTION_RIGHT]
+                directions = list(DIRECTIONS)
                 random.shuffle(directions)
 
                 for direction in directions:
@@ -420,7 +528,7 @@ class Enemy(AnimatedSprite):
                 swim_offset_x = 0
                 swim_offset_y = 0
 
-                if self.current_direction in [DIRECTION_LEFT, DIRECTION_RIGHT]:
+                if self.current_direction in HORIZONTAL_DIRECTIONS:
                     swim_offset_y = math.sin(self.swim_timer * self.swim_frequency) * self.swim_amplitude
                 else:
                     swim_offset_x = math.sin(self.swim_timer * self.swim_frequency) * self.swim_amplitude
@@ -428,23 +536,103 @@ class Enemy(AnimatedSprite):
                 self.pixel_x = self.real_x + swim_offset_x
                 self.pixel_y = self.real_y + swim_offset_y
             else:
-                directions = [DIRECTION_UP, DIRECTION_DOWN, DIRECTION_LEFT, DIRECTION_RIGHT]
-                self.current_direction = random.choice(directions)
+                self.current_direction = random.choice(DIRECTIONS)
+
+        # Afasta dos outros tubarões para não se amontoarem
+        if shark_grid:
+            self.apply_separation(shark_grid, dt, dungeon)
 
         # Atualiza posições dos atores
         self.update_actor_position()
+        self.update_actor_angle()
+
+    def apply_separation(self, shark_grid, dt, dungeon):
+        """Empurra o tubarão para longe dos vizinhos a menos de SEPARATION_RADIUS"""
+        push_x = 0.0
+        push_y = 0.0
+
+        for other in shark_grid.neighbors(self.real_x, self.real_y):
+            if other is self:
+                continue
+
+            dx = self.real_x - other.real_x
+            dy = self.real_y - other.real_y
+            distance_squared = dx * dx + dy * dy
+            if distance_squared >= SEPARATION_RADIUS * SEPARATION_RADIUS:
+                continue
+
+            if distance_squared == 0:
+                # Exatamente sobrepostos: cada um vai para um lado, perpendicular ao nado
+                side = 1 if self.grid_index < other.grid_index else -1
+                push_x -= self.current_direction[1] * side
+                push_y += self.current_direction[0] * side
+                continue
+
+            # Quanto mais perto, mais forte o empurrão
+            distance = math.sqrt(distance_squared)
+            weight = (SEPARATION_RADIUS - distance) / (SEPARATION_RADIUS * distance)
+            push_x += dx * weight
+            push_y += dy * weight
+
+        if push_x == 0 and push_y == 0:
+            return
 
-        # Rotaciona o tubarão com base na direção
+        length = math.sqrt(push_x * push_x + push_y * push_y)
+        if length > 1:
+            push_x /= length
+            push_y /= length
+
+        step_x = push_x * SEPARATION_SPEED * dt
+        step_y = push_y * SEPARATION_SPEED * dt
+        new_grid_x = int((self.real_x + step_x) // GRID_SIZE)
+        new_grid_y = int((self.real_y + step_y) // GRID_SIZE)
+
+        # Nunca empurra para dentro das algas
+        if dungeon.is_walkable(new_grid_x, new_grid_y):
+            self.real_x += step_x
+            self.real_y += step_y
+            self.pixel_x += step_x
+            self.pixel_y += step_y
+            self.grid_x = new_grid_x
+            self.grid_y = new_grid_y
+
+    def update_actor_angle(self):
+        """Rotaciona o tubarão com base na direção"""
+        angle = DIRECTION_ANGLES.get(self.current_direction, 0)
         for actor in self.actors:
-            if actor:
-                # Mapeamento de direções para ângulos
-                direction_angles = {
-                    DIRECTION_RIGHT: 0,
-                    DIRECTION_DOWN: 90,
-                    DIRECTION_LEFT: 180,
-                    DIRECTION_UP: 270
-                }
-                actor.angle = direction_angles.get(self.current_direction, 0)
+            # Só rotaciona a imagem quando o ângulo realmente muda
+            if actor and actor.angle != angle:
+                actor.angle = angle
+
+    def snapshot_state(self):
+        """Retorna o estado do tubarão em formato binário (ENEMY_STATE)"""
+        return ENEMY_STATE.pack(
+            SHARK_TYPES.index(self.enemy_type),
+            self.grid_x, self.grid_y,
+            self.pixel_x, self.pixel_y, self.real_x, self.real_y,
+            self.target_x, self.target_y, self.moving,
+            DIRECTIONS.index(self.current_direction),
+            self.animation_timer, self.current_frame,
+            self.move_timer, self.move_interval,
+            self.patrol_center_x, self.patrol_center_y,
+            self.damage_dealt, self.tired, self.tired_timer, self.swim_timer
+        )
+
+    def restore_state(self, blob, offset):
+        """Restaura o estado salvo por snapshot_state sem recriar os atores"""
+        (_, self.grid_x, self.grid_y,
+         self.pixel_x, self.pixel_y, self.real_x, self.real_y,
+         self.target_x, self.target_y, self.moving,
+         direction,
+         self.animation_timer, self.current_frame,
+         self.move_timer, self.move_interval,
+         self.patrol_center_x, self.patrol_center_y,
+         self.damage_dealt, self.tired, self.tired_timer,
+         self.swim_timer) = ENEMY_STATE.unpack_from(blob, offset)
+
+        self.current_direction = DIRECTIONS[direction]
+        self.update_actor_position()
+        self.update_actor_angle()
 
     def deal_damage(self):
         """Chamado quando o tubarão causa dano"""
@@ -458,8 +646,8 @@ class Enemy(AnimatedSprite):
 class HealthPowerUp(AnimatedSprite):
     """Bolhas de ar com animação de sprite de dois quadros"""
 
-    def __init__(self, x, y):
-        super().__init__(x, y, 'bubble', 0.3)  # Animação rápida para bolhas
+    def __init__(self, x, y, sprites_enabled=True):
+        super().__init__(x, y, 'bubble', 0.3, sprites_enabled)  # Animação rápida para bolhas
         self.float_timer = 0
         self.float_amplitude = 5
         self.base_y = y * GRID_SIZE
@@ -471,23 +659,49 @@ class HealthPowerUp(AnimatedSprite):
         self.float_timer += dt
         self.pixel_y = self.base_y + math.sin(self.float_timer * 2) * self.float_amplitude
 
-        # Atualiza posições dos atores com animação flutuante
-        for actor in self.actors:
-            if actor:
-                actor.pos = (self.pixel_x + GRID_SIZE // 2, self.pixel_y + GRID_SIZE // 2)
-                # Adiciona animação de rotação flutuante
-                actor.angle = math.sin(self.float_timer * 3) * 10
+        self.update_float_pose()
+
+    def update_float_pose(self):
+        """Posiciona e inclina só o quadro visível com a animação flutuante"""
+        actor = self.actors[self.current_frame]
+        if actor:
+            actor.pos = (self.pixel_x + GRID_SIZE // 2, self.pixel_y + GRID_SIZE // 2)
+            # Adiciona animação de rotação flutuante
+            actor.angle = math.sin(self.float_timer * 3) * 10
+
+    def snapshot_state(self):
+        """Retorna o estado da bolha em formato binário (POWERUP_STATE)"""
+        return POWERUP_STATE.pack(
+            self.grid_x, self.grid_y,
+            self.pixel_x, self.pixel_y, self.base_y,
+            self.float_timer, self.animation_timer, self.current_frame
+        )
+
+    def restore_state(self, blob, offset):
+        """Restaura o estado salvo por snapshot_state sem recriar os atores"""
+        (self.grid_x, self.grid_y,
+         self.pixel_x, self.pixel_y, self.base_y,
+         self.float_timer, self.animation_timer,
+         self.current_frame) = POWERUP_STATE.unpack_from(blob, offset)
+
+        self.target_x = self.pixel_x
+        self.target_y = self.base_y
+        self.moving = False
+        self.update_float_pose()
 
 
 class Dungeon:
     """Fundo do oceano com algas marinhas animadas usando sprites de dois quadros"""
 
-    def __init__(self):
+    def __init__(self, sprites_enabled=True):
+        self.sprites_enabled = sprites_enabled
         self.width = GRID_WIDTH
         self.height = GRID_HEIGHT
         self.seaweed = set()
         self.seaweed_types = {}
         self.seaweed_sprites = {}  # Armazena sprites animados para cada alga marinha
+        self.layout_blob = None  # Cache do layout em formato binário (SEAWEED_LAYOUT)
+        self.background = None  # Fundo animado, criado por prepare_background (False sem NumPy)
         self.generate_ocean_floor()
 
     def generate_ocean_floor(self):
@@ -500,7 +714,8 @@ class Dungeon:
             for y_pos in [0, self.height - 1]:
                 seaweed_type = random.choice(['kelp', 'coral', 'anemone'])
                 self.seaweed_types[(x, y_pos)] = seaweed_type
-                self.seaweed_sprites[(x, y_pos)] = AnimatedSprite(x, y_pos, seaweed_type, 0.8)
+                self.seaweed_sprites[(x, y_pos)] = AnimatedSprite(x, y_pos, seaweed_type, 0.8,
+                                                                  self.sprites_enabled)
 
         for y in range(self.height):
             self.seaweed.add((0, y))
@@ -510,7 +725,8 @@ class Dungeon:
             for x_pos in [0, self.width - 1]:
                 seaweed_type = random.choice(['kelp', 'coral', 'anemone'])
                 self.seaweed_types[(x_pos, y)] = seaweed_type
-                self.seaweed_sprites[(x_pos, y)] = AnimatedSprite(x_pos, y, seaweed_type, 0.8)
+                self.seaweed_sprites[(x_pos, y)] = AnimatedSprite(x_pos, y, seaweed_type, 0.8,
+                                                                  self.sprites_enabled)
 
         # Adiciona manchas aleatórias de algas marinhas
         for _ in range(60):
@@ -520,12 +736,58 @@ class Dungeon:
 
             seaweed_type = random.choice(['kelp', 'coral', 'anemone'])
             self.seaweed_types[(x, y)] = seaweed_type
-            self.seaweed_sprites[(x, y)] = AnimatedSprite(x, y, seaweed_type, 0.8)
+            self.seaweed_sprites[(x, y)] = AnimatedSprite(x, y, seaweed_type, 0.8,
+                                                          self.sprites_enabled)
 
     def is_walkable(self, x, y):
         return (x, y) not in self.seaweed and 0 <= x < self.width and 0 <= y < self.height
 
+    def pack_layout(self):
+        """Retorna as posições e tipos das algas marinhas em formato binário"""
+        if self.layout_blob is None:
+            self.layout_blob = b''.join(
+                SEAWEED_LAYOUT.pack(x, y, SEAWEED_TYPES.index(self.seaweed_types[(x, y)]))
+                for x, y in self.seaweed_sprites
+            )
+        return self.layout_blob
+
+    def load_layout(self, layout_blob):
+        """Recria o fundo do oceano a partir de pack_layout, reaproveitando sprites iguais"""
+        old_sprites = self.seaweed_sprites
+        self.seaweed = set()
+        self.seaweed_types = {}
+        self.seaweed_sprites = {}
+
+        for x, y, type_index in SEAWEED_LAYOUT.iter_unpack(layout_blob):
+            seaweed_type = SEAWEED_TYPES[type_index]
+            sprite = old_sprites.get((x, y))
+            if sprite is None or sprite.image_base_name != seaweed_type:
+                sprite = AnimatedSprite(x, y, seaweed_type, 0.8, self.sprites_enabled)
+
+            self.seaweed.add((x, y))
+            self.seaweed_types[(x, y)] = seaweed_type
+            self.seaweed_sprites[(x, y)] = sprite
+
+        self.layout_blob = bytes(layout_blob)
+
+    def create_background(self):
+        """Cria o fundo animado; o NumPy só é importado aqui, fora da inicialização"""
+        try:
+            from ocean_background import OceanBackground
+        except ImportError:
+            return False
+        return OceanBackground(WIDTH, HEIGHT)
+
+    def prepare_background(self):
+        """Gera o fundo animado se ainda não existir (chamado durante o menu)"""
+        if self.background is None and self.sprites_enabled:
+            self.background = self.create_background()
+
     def update(self, dt):
+        # A animação das algas é só visual; sem atores não há o que animar
+        if not self.sprites_enabled:
+            return
+
         # Atualiza todas as animações de sprites de algas marinhas
         for sprite in self.seaweed_sprites.values():
             sprite.update(dt)
@@ -533,10 +795,12 @@ class Dungeon:
     def draw(self, screen):
         global global_timer
 
-        # Fundo do oceano
-        try:
-            screen.blit('ocean_bg', (0, 0))
-        except:
+        # Fundo do oceano: um blit de um quadro pré-calculado
+        self.prepare_background()
+
+        if self.background:
+            screen.blit(self.background.frame_at(global_timer), (0, 0))
+        else:
             screen.fill('midnightblue')
 
         # Desenha algas marinhas com animações de sprites
@@ -555,18 +819,34 @@ class Dungeon:
 class Game:
     """Classe principal do jogo"""
 
-    def __init__(self):
+    def __init__(self, sprites_enabled=True):
+        # False nas simulações de treino: nenhum ator é criado para esta partida
+        self.sprites_enabled = sprites_enabled
         self.powerup_spawn_interval = None
         self.powerup_spawn_timer = None
         self.enemy_spawn_interval = None
         self.enemy_spawn_timer = None
         self.state = GAME_STATE_MENU
-        self.dungeon = Dungeon()
+        self.dungeon = Dungeon(sprites_enabled)
         self.hero = None
         self.enemies = []
         self.health_powerups = []
         self.sound_manager = SoundManager()
         self.game_over_timer = 0
+
+        # Objetos reservados para restaurar snapshots sem carregar sprites de novo
+        self.enemy_pool = []
+        self.powerup_pool = []
+
+        # Limite de tubarões em jogo (ajustável pelas ferramentas de teste de carga)
+        self.max_enemies = 100
+
+        # Broadphase para a separação entre tubarões
+        self.shark_grid = SpatialGrid(GRID_SIZE)
+
+        # O fundo animado é gerado depois que o menu aparece, não no primeiro quadro da partida
+        self.menu_drawn = False
+
         self.reset_game()
 
     def reset_game(self):
@@ -575,7 +855,7 @@ class Game:
             x = random.randint(1, GRID_WIDTH - 2)
             y = random.randint(1, GRID_HEIGHT - 2)
             if self.dungeon.is_walkable(x, y):
-                self.hero = Hero(x, y)
+                self.hero = Hero(x, y, self.sprites_enabled)
                 break
 
         # Cria tubarões para o ínicio
@@ -589,7 +869,7 @@ class Game:
                 y = random.randint(2, GRID_HEIGHT - 3)
                 if (self.dungeon.is_walkable(x, y) and
                         abs(x - self.hero.grid_x) + abs(y - self.hero.grid_y) > 4):
-                    self.enemies.append(Enemy(x, y, shark_type))
+                    self.enemies.append(Enemy(x, y, shark_type, self.sprites_enabled))
                     break
                 attempts += 1
 
@@ -612,13 +892,16 @@ class Game:
 
         self.dungeon.update(dt)
 
+        if self.state == GAME_STATE_MENU and self.menu_drawn:
+            self.dungeon.prepare_background()
+
         if self.state == GAME_STATE_PLAYING:
             if self.hero.alive:
                 self.hero.update(dt, self.dungeon, self.sound_manager)
 
                 # Spawn contínuo de tubarões
                 self.enemy_spawn_timer += dt
-                if self.enemy_spawn_timer >= self.enemy_spawn_interval and len(self.enemies) < 100:
+                if self.enemy_spawn_timer >= self.enemy_spawn_interval and len(self.enemies) < self.max_enemies:
                     self.enemy_spawn_timer = 0
                     self.spawn_new_shark()
 
@@ -631,8 +914,9 @@ class Game:
             hero_pos = (self.hero.grid_x, self.hero.grid_y)
 
             # Atualiza todos os tubarões
+            self.shark_grid.rebuild(self.enemies)
             for enemy in self.enemies:
-                enemy.update(dt, self.dungeon, hero_pos)
+                enemy.update(dt, self.dungeon, hero_pos, self.shark_grid)
 
             # Atualiza bolhas
             for powerup in self.health_powerups:
@@ -692,7 +976,7 @@ class Game:
 
             if (self.dungeon.is_walkable(x, y) and
                     abs(x - self.hero.grid_x) + abs(y - self.hero.grid_y) > 8):
-                self.enemies.append(Enemy(x, y, shark_type))
+                self.enemies.append(Enemy(x, y, shark_type, self.sprites_enabled))
                 break
 
     def spawn_air_bubble(self):
@@ -717,9 +1001,155 @@ class Game:
                         break
 
                 if not occupied:
-                    self.health_powerups.append(HealthPowerUp(x, y))
+                    self.health_powerups.append(HealthPowerUp(x, y, self.sprites_enabled))
                     break
 
+    def snapshot(self):
+        """Captura o estado completo da partida em um bloco binário compacto"""
+        layout_blob = self.dungeon.pack_layout()
+        seaweed_sprites = self.dungeon.seaweed_sprites.values()
+
+        parts = [SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.state,
+            global_timer, self.game_over_timer,
+            self.enemy_spawn_timer, self.enemy_spawn_interval,
+            self.powerup_spawn_timer, self.powerup_spawn_interval,
+            len(self.enemies), len(self.health_powerups), len(seaweed_sprites)
+        ), self.hero.snapshot_state()]
+
+        parts.extend(enemy.snapshot_state() for enemy in self.enemies)
+        parts.extend(powerup.snapshot_state() for powerup in self.health_powerups)
+        parts.append(layout_blob)
+        parts.extend(SEAWEED_STATE.pack(sprite.animation_timer, sprite.current_frame)
+                     for sprite in seaweed_sprites)
+
+        # Estado do gerador aleatório: versão, 625 inteiros e o próximo gauss
+        _, internal_state, gauss_next = random.getstate()
+        parts.append(RNG_STATE.pack(*internal_state, gauss_next is not None, gauss_next or 0.0))
+
+        return b''.join(parts)
+
+    def restore(self, blob):
+        """Restaura um estado capturado por snapshot() sem recarregar os sprites"""
+        global global_timer
+
+        # Valida tudo antes de alterar o jogo: um snapshot ruim não pode deixá-lo pela metade
+        if len(blob) < SNAPSHOT_HEADER.size:
+            raise ValueError("Snapshot truncado")
+
+        (magic, version, state,
+         timer, game_over_timer,
+         enemy_spawn_timer, enemy_spawn_interval,
+         powerup_spawn_timer, powerup_spawn_interval,
+         enemy_count, powerup_count, seaweed_count) = SNAPSHOT_HEADER.unpack_from(blob, 0)
+
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Snapshot inválido ou de versão incompatível")
+
+        expected_size = (SNAPSHOT_HEADER.size + HERO_STATE.size +
+                         enemy_count * ENEMY_STATE.size +
+                         powerup_count * POWERUP_STATE.size +
+                         seaweed_count * (SEAWEED_LAYOUT.size + SEAWEED_STATE.size) +
+                         RNG_STATE.size)
+        if len(blob) != expected_size:
+            raise ValueError(f"Snapshot com {len(blob)} bytes, esperado {expected_size}")
+
+        self.check_snapshot_indices(blob, enemy_count, powerup_count, seaweed_count)
+
+        self.state = state
+        global_timer = timer
+        self.game_over_timer = game_over_timer
+        self.enemy_spawn_timer = enemy_spawn_timer
+        self.enemy_spawn_interval = enemy_spawn_interval
+        self.powerup_spawn_timer = powerup_spawn_timer
+        self.powerup_spawn_interval = powerup_spawn_interval
+
+        offset = SNAPSHOT_HEADER.size
+        self.hero.restore_state(blob, offset)
+        offset += HERO_STATE.size
+
+        # Reaproveita tubarões do mesmo tipo (em jogo ou reservados)
+        available = {}
+        for enemy in self.enemies + self.enemy_pool:
+            available.setdefault(enemy.enemy_type, []).append(enemy)
+
+        self.enemies = []
+        for _ in range(enemy_count):
+            shark_type = SHARK_TYPES[blob[offset]]
+            candidates = available.get(shark_type)
+            enemy = candidates.pop() if candidates else Enemy(0, 0, shark_type, self.sprites_enabled)
+            enemy.restore_state(blob, offset)
+            self.enemies.append(enemy)
+            offset += ENEMY_STATE.size
+
+        self.enemy_pool = [enemy for candidates in available.values() for enemy in candidates]
+
+        # Reaproveita bolhas de ar
+        available = self.health_powerups + self.powerup_pool
+        self.health_powerups = []
+        for _ in range(powerup_count):
+            powerup = available.pop() if available else HealthPowerUp(0, 0, self.sprites_enabled)
+            powerup.restore_state(blob, offset)
+            self.health_powerups.append(powerup)
+            offset += POWERUP_STATE.size
+
+        self.powerup_pool = available
+
+        # Só recria o fundo do oceano se o layout for diferente do atual
+        layout_end = offset + seaweed_count * SEAWEED_LAYOUT.size
+        if blob[offset:layout_end] != self.dungeon.pack_layout():
+            self.dungeon.load_layout(blob[offset:layout_end])
+        offset = layout_end
+
+        for sprite in self.dungeon.seaweed_sprites.values():
+            sprite.animation_timer, sprite.current_frame = SEAWEED_STATE.unpack_from(blob, offset)
+            offset += SEAWEED_STATE.size
+
+        # Restaura o gerador aleatório por último (criar sprites consome números aleatórios)
+        rng_state = RNG_STATE.unpack_from(blob, offset)
+        gauss_next = rng_state[626] if rng_state[625] else None
+        random.setstate((3, rng_state[:625], gauss_next))
+
+    def check_snapshot_indices(self, blob, enemy_count, powerup_count, seaweed_count):
+        """Verifica os bytes usados como índice (direções, tipos e quadros) de um snapshot
+
+        Chamado por restore() antes de alterar qualquer coisa; levanta ValueError.
+        """
+        offset = SNAPSHOT_HEADER.size
+        hero_state = HERO_STATE.unpack_from(blob, offset)
+        direction, next_direction, frame = hero_state[8], hero_state[9], hero_state[13]
+        if (direction >= len(DIRECTIONS) or frame > 1 or
+                (next_direction >= len(DIRECTIONS) and next_direction != NO_DIRECTION)):
+            raise ValueError("Snapshot com estado do Nemo inválido")
+        offset += HERO_STATE.size
+
+        for _ in range(enemy_count):
+            enemy_state = ENEMY_STATE.unpack_from(blob, offset)
+            shark_type, direction, frame = enemy_state[0], enemy_state[10], enemy_state[12]
+            if shark_type >= len(SHARK_TYPES) or direction >= len(DIRECTIONS) or frame > 1:
+                raise ValueError("Snapshot com estado de tubarão inválido")
+            offset += ENEMY_STATE.size
+
+        for _ in range(powerup_count):
+            if POWERUP_STATE.unpack_from(blob, offset)[7] > 1:
+                raise ValueError("Snapshot com estado de bolha inválido")
+            offset += POWERUP_STATE.size
+
+        for x, y, type_index in SEAWEED_LAYOUT.iter_unpack(
+                blob[offset:offset + seaweed_count * SEAWEED_LAYOUT.size]):
+            if type_index >= len(SEAWEED_TYPES):
+                raise ValueError("Snapshot com tipo de alga inválido")
+        offset += seaweed_count * SEAWEED_LAYOUT.size
+
+        for _ in range(seaweed_count):
+            if SEAWEED_STATE.unpack_from(blob, offset)[1] > 1:
+                raise ValueError("Snapshot com estado de alga inválido")
+            offset += SEAWEED_STATE.size
+
+        # O último inteiro do Mersenne Twister é a posição no vetor de 624 palavras
+        if RNG_STATE.unpack_from(blob, offset)[624] > 624:
+            raise ValueError("Snapshot com estado do gerador aleatório inválido")
+
     def handle_key(self, key):
         if self.state == GAME_STATE_PLAYING and self.hero.alive:
             if key == keys.UP or key == keys.W:
@@ -732,12 +1162,23 @@ class Game:
                 self.hero.change_direction(DIRECTION_RIGHT)
             elif key == keys.ESCAPE:
                 self.state = GAME_STATE_MENU
+            elif key == keys.M:
+                self.print_memory_report()
 
         elif self.state == GAME_STATE_GAME_OVER:
             if key == keys.SPACE:
                 self.reset_game()
                 self.state = GAME_STATE_PLAYING
 
+    def print_memory_report(self):
+        """Mostra no console a memória usada por tipo de entidade e pelos recursos"""
+        import memory_report
+
+        report = memory_report.memory_report(self)
+        print(memory_report.format_report(report))
+        for violation in memory_report.check_budgets(report):
+            print(f"Over budget: {violation}")
+
     def handle_mouse_click(self, pos):
         if self.state == GAME_STATE_MENU:
             x, y = pos
@@ -755,11 +1196,11 @@ class Game:
                 self.sound_manager.play_menu_select()
 
             elif 300 <= x <= 500 and 410 <= y <= 460:
-                import sys
                 sys.exit()
 
     def draw_game(self, screen):
         if self.state == GAME_STATE_MENU:
+            self.menu_drawn = True
             screen.fill('darkblue')
 
             screen.draw.text(
@@ -854,10 +1295,17 @@ class Game:
 # Instância global do jogo
 game = Game()
 
+# Telemetria opcional dos quiosques (ativada pela variável de ambiente NEMO_TELEMETRY)
+frame_telemetry = telemetry.from_environment()
+
 
 # Funções necessárias para o PgZero
 def update(dt):
+    if frame_telemetry:
+        frame_telemetry.begin_update()
     game.update_game(dt)
+    if frame_telemetry:
+        frame_telemetry.end_update(game)
 
 
 def on_key_down(key):
@@ -869,4 +1317,8 @@ def on_mouse_down(pos):
 
 
 def draw():
-    game.draw_game(screen)
\ No newline at end of file
+    if frame_telemetry:
+        frame_telemetry.begin_draw()
+    game.draw_game(screen)
+    if frame_telemetry:
+        frame_telemetry.end_draw()
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""Relatório de memória por tipo de entidade e por superfícies dos recursos
+
+Pode ser chamado com o jogo rodando (tecla M durante a partida) ou pelas
+ferramentas de benchmark (python stress_test.py memory).
+"""
+
+import sys
+import tracemalloc
+import types
+
+import pygame
+from pgzero import loaders
+
+# Orçamento por entidade em bytes (objetos Python + superfícies próprias)
+ENTITY_BUDGETS = {
+    'Hero': 16 * 1024,
+    'Enemy': 40 * 1024,
+    'HealthPowerUp': 48 * 1024,
+    'Seaweed': 4 * 1024,
+}
+
+# Objetos compartilhados que não pertencem a nenhuma entidade
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, pygame.Surface)
+
+
+def surface_bytes(surface):
+    """Bytes de pixels de uma superfície (alocados pelo SDL, fora do tracemalloc)"""
+    return surface.get_pitch() * surface.get_height()
+
+
+def deep_sizeof(obj, seen):
+    """Soma sys.getsizeof do objeto e de tudo que ele referencia ainda não visto"""
+    if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_sizeof(item, seen)
+
+    if hasattr(obj, '__dict__'):
+        size += deep_sizeof(vars(obj), seen)
+    for slot in getattr(type(obj), '__slots__', ()):
+        if hasattr(obj, slot):
+            size += deep_sizeof(getattr(obj, slot), seen)
+
+    return size
+
+
+def entity_actors(entity):
+    """Todos os atores de uma entidade (o Nemo guarda oito, os demais dois)"""
+    if hasattr(entity, 'direction_actors'):
+        return [actor for actors in entity.direction_actors.values() for actor in actors if actor]
+    return [actor for actor in entity.actors if actor]
+
+
+def owned_surface_bytes(entity):
+    """Superfícies criadas só para esta entidade, como as cópias rotacionadas"""
+    total = 0
+    for actor in entity_actors(entity):
+        if actor._surf is not actor._orig_surf:
+            total += surface_bytes(actor._surf)
+    return total
+
+
+def entity_groups(game):
+    return {
+        'Hero': [game.hero] if game.hero else [],
+        'Enemy': game.enemies,
+        'HealthPowerUp': game.health_powerups,
+        'Seaweed': list(game.dungeon.seaweed_sprites.values()),
+    }
+
+
+def asset_bytes():
+    """Memória das imagens e sons já carregados pelos loaders do PgZero"""
+    images = sum(surface_bytes(surface) for surface in loaders.images.cache.values())
+
+    sounds = 0
+    mixer = pygame.mixer.get_init()
+    if mixer:
+        frequency, sample_format, channels = mixer
+        bytes_per_second = frequency * channels * abs(sample_format) // 8
+        sounds = sum(int(sound.get_length() * bytes_per_second)
+                     for sound in loaders.sounds.cache.values())
+
+    return {'images': images, 'sounds': sounds}
+
+
+def memory_report(game):
+    """Bytes por tipo de entidade, com média por instância, e bytes dos recursos"""
+    seen = set()
+    entities = {}
+
+    for name, group in entity_groups(game).items():
+        python_bytes = sum(deep_sizeof(entity, seen) for entity in group)
+        surfaces = sum(owned_surface_bytes(entity) for entity in group)
+        count = len(group)
+        entities[name] = {
+            'count': count,
+            'python_bytes': python_bytes,
+            'surface_bytes': surfaces,
+            'per_entity': (python_bytes + surfaces) // count if count else 0,
+        }
+
+    assets = asset_bytes()
+    background = game.dungeon.background
+    assets['background'] = sum(surface_bytes(frame) for frame in background.frames) if background else 0
+
+    return {'entities': entities, 'assets': assets}
+
+
+def project_bytes(report, name, count):
+    """Estimativa de memória para `count` entidades do tipo `name`"""
+    return report['entities'][name]['per_entity'] * count
+
+
+def check_budgets(report, budgets=ENTITY_BUDGETS):
+    """Lista as entidades cuja média por instância passa do orçamento"""
+    violations = []
+    for name, stats in report['entities'].items():
+        budget = budgets.get(name)
+        if budget is not None and stats['count'] and stats['per_entity'] > budget:
+            violations.append(f"{name}: {stats['per_entity']} bytes per entity "
+                              f"(budget {budget})")
+    return violations
+
+
+def measure_allocation(factory, count=100):
+    """Bytes alocados em Python por instância criada por `factory` (via tracemalloc)
+
+    Não inclui pixels de superfícies, que o SDL aloca fora do alocador do Python.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+
+    before = tracemalloc.take_snapshot()
+    instances = [factory() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+
+    if not was_tracing:
+        tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del instances
+    return allocated // count
+
+
+def format_report(report):
+    lines = [f"{'entity':<14} {'count':>6} {'python KiB':>11} {'surfaces KiB':>13} {'bytes/entity':>13}"]
+    for name, stats in report['entities'].items():
+        lines.append(f"{name:<14} {stats['count']:6d} {stats['python_bytes'] / 1024:11.1f} "
+                     f"{stats['surface_bytes'] / 1024:13.1f} {stats['per_entity']:13d}")
+
+    assets = report['assets']
+    lines.append(f"assets: images {assets['images'] / 1024:.1f} KiB, "
+                 f"sounds {assets['sounds'] / 1024:.1f} KiB, "
+                 f"background {assets['background'] / 1024:.1f} KiB")
+    return '\n'.join(lines)
@@ -0,0 +1,74 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Build do executável para Linux: use ./build_linux.sh (gera o assets.pak antes)
+#
+# Modo onedir (sem onefile): o onefile descompacta tudo em /tmp a cada execução,
+# o que deixava a tela preta por vários segundos nos quiosques.
+from PyInstaller.utils.hooks import collect_data_files
+
+# main.py é executado a partir do código-fonte pelo run_game.py, então os módulos
+# que ele importa precisam ser listados aqui
+hiddenimports = [
+    'telemetry',
+    'ocean_background',
+    'memory_report',
+]
+
+# Módulos que o jogo não usa; menos código para carregar na inicialização
+excludes = [
+    'pkg_resources',  # pygame.pkgdata tem alternativa sem ele (~100 ms a menos)
+    'setuptools',
+    'distutils',
+    'tkinter',
+    'unittest',
+    'doctest',
+    'pydoc',
+    'pdb',
+    'xmlrpc',
+    'pygame.tests',
+    'pygame.examples',
+    'pygame.docs',
+    'pygame._sdl2.video',
+    'numpy.f2py',
+    'numpy.distutils',
+    'numpy.testing',
+]
+
+a = Analysis(
+    ['run_game.py'],
+    pathex=[],
+    binaries=[],
+    datas=[
+        ('main.py', '.'),
+        ('assets.pak', '.'),
+        ('music', 'music'),
+    ] + collect_data_files('pgzero'),  # ícone padrão e fontes do PgZero
+    hiddenimports=hiddenimports,
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=excludes,
+    noarchive=False,
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='nemo',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,  # strip corrompe a OpenBLAS empacotada com o NumPy
+    upx=False,
+    name='nemo',
+)
@@ -0,0 +1,65 @@
+"""Ponto de entrada do executável (PyInstaller)
+
+Faz o mesmo que `pgzrun main.py`, mas antes carrega o assets.pak nos caches
+do PgZero. Com NEMO_COLDSTART_PROBE=1 o jogo fecha logo após mostrar o
+primeiro quadro do menu, para medir o tempo de inicialização.
+"""
+
+import os
+import sys
+import time
+
+START_TIME = time.perf_counter()
+
+COLDSTART_PROBE_ENV = 'NEMO_COLDSTART_PROBE'
+
+
+def game_dir():
+    # No executável os arquivos de dados ficam em sys._MEIPASS
+    if getattr(sys, 'frozen', False):
+        return sys._MEIPASS
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    import types
+
+    import pygame
+    from pgzero import runner
+
+    import asset_pack
+
+    base = game_dir()
+    path = os.path.join(base, 'main.py')
+    with open(path) as f:
+        code = compile(f.read(), 'main.py', 'exec', dont_inherit=True)
+
+    module = types.ModuleType('main')
+    module.__file__ = path
+    sys.modules['main'] = module
+    sys._pgzrun = True
+
+    runner.prepare_mod(module)
+
+    pack_path = os.path.join(base, asset_pack.PACK_NAME)
+    if os.path.exists(pack_path):
+        asset_pack.install_pack(pack_path)
+
+    exec(code, module.__dict__)
+
+    if os.environ.get(COLDSTART_PROBE_ENV):
+        draw = module.draw
+
+        def probe_draw():
+            draw()
+            pygame.display.flip()
+            print(f"first frame after {time.perf_counter() - START_TIME:.3f} s")
+            sys.exit(0)
+
+        module.draw = probe_draw
+
+    runner.run_mod(module)
+
+
+if __name__ == '__main__':
+    main()
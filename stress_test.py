@@ -0,0 +1,298 @@
+"""Teste de carga do jogo: busca o limite do orçamento de quadro e roda sessões longas
+
+Uso:
+    python stress_test.py ramp [--entity sharks|bubbles|seaweed|all]
+    python stress_test.py soak [--frames N] [--no-cap]
+    python stress_test.py memory [--count N]
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+import tracemalloc
+
+import memory_report
+from headless import load_game_module
+
+FRAME_BUDGET_MS = 1000 / 60  # 16,7 ms por quadro a 60 FPS
+DT = 1 / 60
+
+ENTITY_KINDS = ('sharks', 'bubbles', 'seaweed')
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(math.ceil(fraction * len(ordered))) - 1)
+    return ordered[max(0, index)]
+
+
+def random_free_cell(main, dungeon, margin=2):
+    """Sorteia uma célula navegável longe da borda"""
+    while True:
+        x = random.randint(margin, main.GRID_WIDTH - 1 - margin)
+        y = random.randint(margin, main.GRID_HEIGHT - 1 - margin)
+        if dungeon.is_walkable(x, y):
+            return x, y
+
+
+def build_scene(main, kind, count):
+    """Prepara uma partida com `count` entidades extras do tipo pedido
+
+    Retorna quantas entidades foram realmente criadas (as algas são limitadas
+    pelo número de células livres da grade).
+    """
+    game = main.game
+    random.seed(count)
+    game.dungeon = main.Dungeon()
+    game.reset_game()
+    game.state = main.GAME_STATE_PLAYING
+
+    # Mantém as quantidades fixas durante a medição
+    game.enemy_spawn_interval = float('inf')
+    game.powerup_spawn_interval = float('inf')
+
+    if kind == 'sharks':
+        game.enemies = []
+        for _ in range(count):
+            x, y = random_free_cell(main, game.dungeon)
+            game.enemies.append(main.Enemy(x, y, random.choice(main.SHARK_TYPES)))
+        return count
+
+    if kind == 'bubbles':
+        for _ in range(count):
+            x, y = random_free_cell(main, game.dungeon, margin=1)
+            game.health_powerups.append(main.HealthPowerUp(x, y))
+        return count
+
+    # Algas: ocupa células livres, sem prender o Nemo nem os tubarões dentro delas
+    dungeon = game.dungeon
+    occupied = {(game.hero.grid_x, game.hero.grid_y)}
+    occupied.update((enemy.grid_x, enemy.grid_y) for enemy in game.enemies)
+    free_cells = [(x, y)
+                  for x in range(1, main.GRID_WIDTH - 1)
+                  for y in range(1, main.GRID_HEIGHT - 1)
+                  if dungeon.is_walkable(x, y) and (x, y) not in occupied]
+    random.shuffle(free_cells)
+
+    added = 0
+    for x, y in free_cells[:count]:
+        seaweed_type = random.choice(main.SEAWEED_TYPES)
+        dungeon.seaweed.add((x, y))
+        dungeon.seaweed_types[(x, y)] = seaweed_type
+        dungeon.seaweed_sprites[(x, y)] = main.AnimatedSprite(x, y, seaweed_type, 0.8)
+        added += 1
+    dungeon.layout_blob = None
+    return added
+
+
+def measure_frames(main, frames, draw, warmup=30):
+    """Retorna a lista de tempos de quadro (ms) para update ou update+draw"""
+    game = main.game
+    timings = []
+
+    for i in range(warmup + frames):
+        # Nemo invencível: a partida não pode terminar no meio da medição
+        game.hero.health = 100
+
+        start = time.perf_counter()
+        game.update_game(DT)
+        if draw:
+            game.draw_game(main.screen)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if i >= warmup:
+            timings.append(elapsed)
+
+    return timings
+
+
+class BudgetSearch:
+    """Busca exponencial seguida de bisseção do ponto onde o quadro estoura o orçamento"""
+
+    def __init__(self, main, kind, frames, budget_ms, max_count):
+        self.main = main
+        self.kind = kind
+        self.frames = frames
+        self.budget_ms = budget_ms
+        self.max_count = max_count
+        self.results = {}  # count -> (p95 update, p95 update+draw, entidades reais)
+        self.saturated_at = None  # Preenchido quando a grade não comporta mais entidades
+
+    def probe(self, count):
+        if count not in self.results:
+            actual = build_scene(self.main, self.kind, count)
+            update_ms = percentile(measure_frames(self.main, self.frames, draw=False), 0.95)
+            build_scene(self.main, self.kind, count)
+            full_ms = percentile(measure_frames(self.main, self.frames, draw=True), 0.95)
+            self.results[count] = (update_ms, full_ms, actual)
+            print(f"  {self.kind:>8} {actual:6d}  update p95 {update_ms:7.2f} ms"
+                  f"  update+draw p95 {full_ms:7.2f} ms")
+        return self.results[count]
+
+    def breakpoint(self, column):
+        """Menor quantidade de entidades cujo p95 (coluna 0 ou 1) estoura o orçamento"""
+        low, high = 0, 8
+        while high <= self.max_count:
+            update_ms, full_ms, actual = self.probe(high)
+            if (update_ms, full_ms)[column] > self.budget_ms:
+                break
+            if actual < high:
+                self.saturated_at = actual
+                return None
+            low, high = high, high * 2
+        else:
+            return None
+
+        while high - low > max(1, low // 20):
+            middle = (low + high) // 2
+            if self.probe(middle)[column] > self.budget_ms:
+                high = middle
+            else:
+                low = middle
+
+        return self.results[high][2]
+
+
+def run_ramp(args):
+    main = load_game_module()
+    kinds = ENTITY_KINDS if args.entity == 'all' else (args.entity,)
+
+    print(f"Frame budget: {args.budget:.1f} ms (p95 over {args.frames} frames)")
+    for kind in kinds:
+        print(f"\nRamping {kind}...")
+        search = BudgetSearch(main, kind, args.frames, args.budget, args.max_count)
+        update_limit = search.breakpoint(0)
+        full_limit = search.breakpoint(1)
+
+        for label, limit in (("update", update_limit), ("update+draw", full_limit)):
+            if limit is None:
+                ceiling = search.saturated_at or args.max_count
+                print(f"  {kind}: {label} stays within budget up to {ceiling}")
+            else:
+                print(f"  {kind}: {label} exceeds budget at {limit}")
+
+
+def run_soak(args):
+    main = load_game_module()
+    game = main.game
+
+    random.seed(args.seed)
+    game.dungeon = main.Dungeon()
+    game.reset_game()
+    game.state = main.GAME_STATE_PLAYING
+    if args.no_cap:
+        game.max_enemies = float('inf')
+
+    tracemalloc.start()
+    samples = []
+    start = time.perf_counter()
+
+    print(f"{'frame':>8} {'sharks':>7} {'bubbles':>8} {'traced KiB':>11} {'frame ms':>9}")
+    for frame in range(1, args.frames + 1):
+        game.hero.health = 100
+
+        frame_start = time.perf_counter()
+        game.update_game(DT)
+        if args.draw:
+            game.draw_game(main.screen)
+        frame_ms = (time.perf_counter() - frame_start) * 1000
+
+        if frame % args.sample_every == 0:
+            traced, _ = tracemalloc.get_traced_memory()
+            sample = (frame, len(game.enemies), len(game.health_powerups), traced, frame_ms)
+            samples.append(sample)
+            print(f"{frame:8d} {sample[1]:7d} {sample[2]:8d} {traced / 1024:11.1f} {frame_ms:9.2f}")
+
+    tracemalloc.stop()
+    elapsed = time.perf_counter() - start
+    print(f"\nSimulated {args.frames * DT / 60:.1f} game minutes in {elapsed:.1f} s")
+
+    if len(samples) < 4:
+        return
+
+    # Compara a segunda metade da sessão com a primeira: se listas ou memória
+    # continuam crescendo depois do aquecimento, há crescimento sem limite
+    half = samples[len(samples) // 2]
+    last = samples[-1]
+    for label, column in (("sharks", 1), ("bubbles", 2)):
+        if last[column] > half[column]:
+            print(f"WARNING: {label} list still growing "
+                  f"({half[column]} -> {last[column]} in the second half)")
+
+    growth_kib = (last[3] - half[3]) / 1024
+    if growth_kib > args.max_growth_kib:
+        print(f"WARNING: traced memory grew {growth_kib:.1f} KiB in the second half")
+    else:
+        print(f"Traced memory growth in the second half: {growth_kib:.1f} KiB")
+
+
+def run_memory(args):
+    main = load_game_module()
+    game = main.game
+
+    # Cena com tubarões e bolhas, rodada por alguns segundos para que as
+    # cópias rotacionadas dos atores existam como no jogo real
+    build_scene(main, 'sharks', args.count)
+    for _ in range(args.bubbles):
+        x, y = random_free_cell(main, game.dungeon, margin=1)
+        game.health_powerups.append(main.HealthPowerUp(x, y))
+    measure_frames(main, args.frames, draw=False, warmup=0)
+
+    report = memory_report.memory_report(game)
+    print(memory_report.format_report(report))
+
+    print("\nPython allocations per new instance (tracemalloc):")
+    factories = {
+        'Hero': lambda: main.Hero(3, 3),
+        'Enemy': lambda: main.Enemy(3, 3, 'great_white'),
+        'HealthPowerUp': lambda: main.HealthPowerUp(3, 3),
+        'Seaweed': lambda: main.AnimatedSprite(3, 3, 'kelp', 0.8),
+    }
+    for name, factory in factories.items():
+        print(f"  {name:<14} {memory_report.measure_allocation(factory):8d} bytes")
+
+    projected = memory_report.project_bytes(report, 'Enemy', args.project_sharks)
+    print(f"\nProjected cost of {args.project_sharks} sharks: {projected / 1024 / 1024:.1f} MiB")
+
+    violations = memory_report.check_budgets(report)
+    for violation in violations:
+        print(f"Over budget: {violation}")
+    if violations:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress and soak tests for Nemo's Ocean Adventure")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ramp = subparsers.add_parser('ramp', help="find the entity count that exceeds the frame budget")
+    ramp.add_argument('--entity', choices=ENTITY_KINDS + ('all',), default='all')
+    ramp.add_argument('--frames', type=int, default=120, help="measured frames per probe")
+    ramp.add_argument('--budget', type=float, default=FRAME_BUDGET_MS, help="frame budget in ms")
+    ramp.add_argument('--max-count', type=int, default=8192)
+    ramp.set_defaults(func=run_ramp)
+
+    soak = subparsers.add_parser('soak', help="run a long session and watch for unbounded growth")
+    soak.add_argument('--frames', type=int, default=60 * 60 * 30, help="frames to simulate (default 30 min)")
+    soak.add_argument('--sample-every', type=int, default=60 * 60)
+    soak.add_argument('--draw', action='store_true', help="also draw every frame")
+    soak.add_argument('--no-cap', action='store_true', help="remove the shark cap (Game.max_enemies)")
+    soak.add_argument('--max-growth-kib', type=float, default=256)
+    soak.add_argument('--seed', type=int, default=0)
+    soak.set_defaults(func=run_soak)
+
+    memory = subparsers.add_parser('memory', help="report memory per entity type and check budgets")
+    memory.add_argument('--count', type=int, default=200, help="sharks in the measured scene")
+    memory.add_argument('--bubbles', type=int, default=20, help="air bubbles in the measured scene")
+    memory.add_argument('--frames', type=int, default=120, help="frames to run before measuring")
+    memory.add_argument('--project-sharks', type=int, default=1000)
+    memory.set_defaults(func=run_memory)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""Telemetria de quadros para os quiosques em produção
+
+Ativada pela variável de ambiente NEMO_TELEMETRY (caminho do arquivo .jsonl).
+O laço do jogo só adiciona registros em um buffer circular; a escrita em disco,
+com limite de tamanho e rotação dos arquivos, acontece em uma thread separada.
+
+Limite em disco: cada arquivo tem no máximo max_bytes (o arquivo é rotacionado
+antes do registro que passaria do limite), então o total fica em até
+(backup_count + 1) * max_bytes. Só um registro maior que max_bytes sozinho,
+o que não acontece com os tamanhos padrão, ocuparia um arquivo próprio maior.
+
+Formato (uma linha JSON por registro):
+    {"t": 12.345, "u": 1.92, "d": 6.41, "e": 23, "p": 2, "s": 2}   quadro
+    {"t": 15.000, "event": "state", "from": 2, "to": 3}              transição de estado
+    {"t": 20.000, "event": "dropped", "count": 40}                   registros perdidos
+"""
+
+import atexit
+import collections
+import json
+import os
+import threading
+import time
+
+TELEMETRY_ENV = 'NEMO_TELEMETRY'
+
+
+class TelemetryRecorder:
+    """Coleta tempos de update/draw, contagem de entidades e mudanças de estado"""
+
+    def __init__(self, path, capacity=4096, sample_every=1, flush_interval=5.0,
+                 max_bytes=1024 * 1024, backup_count=3):
+        self.path = path
+        self.capacity = capacity
+        self.sample_every = sample_every
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        # deque com maxlen: append/popleft são seguros entre threads e descartam o mais antigo
+        self.buffer = collections.deque(maxlen=capacity)
+        self.dropped = 0  # Só o laço do jogo escreve aqui
+        self.reported_dropped = 0  # Só a thread de escrita escreve aqui
+
+        self.start_time = time.perf_counter()
+        self.frame = 0
+        self.update_start = 0
+        self.draw_start = 0
+        self.pending = None  # Registro do quadro atual, completado pelo draw
+        self.last_state = None
+
+        self.stop_event = threading.Event()
+        self.writer = threading.Thread(target=self.run_writer, name='telemetry-writer', daemon=True)
+        self.writer.start()
+
+    def elapsed(self):
+        return round(time.perf_counter() - self.start_time, 3)
+
+    def push(self, record):
+        if len(self.buffer) == self.capacity:
+            self.dropped += 1
+        self.buffer.append(record)
+
+    def begin_update(self):
+        # Quadro anterior sem draw: registra mesmo assim
+        if self.pending:
+            self.push(self.pending)
+            self.pending = None
+        self.update_start = time.perf_counter()
+
+    def end_update(self, game):
+        update_ms = (time.perf_counter() - self.update_start) * 1000
+
+        if game.state != self.last_state:
+            if self.last_state is not None:
+                self.push({'t': self.elapsed(), 'event': 'state',
+                           'from': self.last_state, 'to': game.state})
+            self.last_state = game.state
+
+        self.frame += 1
+        if self.frame % self.sample_every == 0:
+            self.pending = {
+                't': self.elapsed(),
+                'u': round(update_ms, 3),
+                'd': None,
+                'e': len(game.enemies),
+                'p': len(game.health_powerups),
+                's': game.state,
+            }
+
+    def begin_draw(self):
+        self.draw_start = time.perf_counter()
+
+    def end_draw(self):
+        if self.pending:
+            self.pending['d'] = round((time.perf_counter() - self.draw_start) * 1000, 3)
+            self.push(self.pending)
+            self.pending = None
+
+    def run_writer(self):
+        """Thread de escrita: esvazia o buffer periodicamente até close()"""
+        while not self.stop_event.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        lines = []
+        while self.buffer:
+            lines.append(json.dumps(self.buffer.popleft(), separators=(',', ':')) + '\n')
+
+        dropped = self.dropped - self.reported_dropped
+        if dropped:
+            self.reported_dropped += dropped
+            lines.append(json.dumps({'t': self.elapsed(), 'event': 'dropped', 'count': dropped},
+                                    separators=(',', ':')) + '\n')
+
+        if not lines:
+            return
+
+        try:
+            self.write_lines(lines)
+        except OSError:
+            # Disco cheio ou sem permissão: a telemetria nunca pode derrubar o jogo
+            pass
+
+    def write_lines(self, lines):
+        """Anexa as linhas, rotacionando antes de qualquer uma que passaria de max_bytes"""
+        # json.dumps gera só ASCII, então caracteres e bytes coincidem
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        chunk = []
+
+        for line in lines:
+            if size and size + len(line) > self.max_bytes:
+                self.append_chunk(chunk)
+                self.rotate()
+                chunk = []
+                size = 0
+            chunk.append(line)
+            size += len(line)
+
+        self.append_chunk(chunk)
+
+    def append_chunk(self, chunk):
+        if chunk:
+            with open(self.path, 'a') as f:
+                f.write(''.join(chunk))
+
+    def rotate(self):
+        """telemetry.jsonl -> telemetry.jsonl.1 -> ... -> .N (o mais antigo é removido)"""
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self):
+        """Para a thread de escrita e grava o que ainda estiver no buffer"""
+        if self.pending:
+            self.push(self.pending)
+            self.pending = None
+        self.stop_event.set()
+        self.writer.join()
+
+
+def from_environment():
+    """Cria o gravador se NEMO_TELEMETRY estiver definida, senão retorna None"""
+    path = os.environ.get(TELEMETRY_ENV)
+    if not path:
+        return None
+
+    recorder = TelemetryRecorder(path)
+    atexit.register(recorder.close)
+    return recorder
@@ -0,0 +1,65 @@
+"""Snapshot/restore da partida: ida e volta e rejeição de blobs corrompidos"""
+
+import pytest
+
+from headless import load_game_module
+
+main = load_game_module()
+
+
+def new_game():
+    main.random.seed(7)
+    game = main.Game()
+    game.state = main.GAME_STATE_PLAYING
+    for _ in range(30):
+        game.update_game(1 / 60)
+    return game
+
+
+def test_round_trip():
+    game = new_game()
+    blob = game.snapshot()
+
+    for _ in range(30):
+        game.update_game(1 / 60)
+    game.restore(blob)
+
+    assert game.snapshot() == blob
+
+
+def corrupt(blob, offset, value):
+    data = bytearray(blob)
+    data[offset] = value
+    return bytes(data)
+
+
+@pytest.mark.parametrize('field', ['shark_type', 'shark_direction', 'hero_direction',
+                                   'seaweed_type', 'magic', 'length'])
+def test_corrupt_blob_leaves_game_untouched(field):
+    game = new_game()
+    blob = game.snapshot()
+    enemies = list(game.enemies)
+
+    hero_offset = main.SNAPSHOT_HEADER.size
+    enemy_offset = hero_offset + main.HERO_STATE.size
+    layout_offset = (enemy_offset + len(game.enemies) * main.ENEMY_STATE.size +
+                     len(game.health_powerups) * main.POWERUP_STATE.size)
+
+    if field == 'shark_type':
+        bad = corrupt(blob, enemy_offset, 9)
+    elif field == 'shark_direction':
+        bad = corrupt(blob, enemy_offset + 1 + 2 + 2 + 6 * 8 + 1, 4)
+    elif field == 'hero_direction':
+        bad = corrupt(blob, hero_offset + 2 + 2 + 4 * 8 + 2 + 1, 7)
+    elif field == 'seaweed_type':
+        bad = corrupt(blob, layout_offset + 2, 3)
+    elif field == 'magic':
+        bad = corrupt(blob, 0, ord('X'))
+    else:
+        bad = blob[:-1]
+
+    with pytest.raises(ValueError):
+        game.restore(bad)
+
+    assert game.enemies == enemies
+    assert game.snapshot() == blob
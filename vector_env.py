@@ -0,0 +1,223 @@
+"""Ambiente vetorizado para treinar bots: N oceanos independentes em um processo
+
+Cada oceano é um Game completo (mesma lógica de Hero, Enemy e Dungeon), mas
+sem atores, sons nem desenho. Todos avançam juntos a cada step():
+
+    env = OceanVectorEnv(1024, seed=0)
+    observations = env.reset()
+    observations, rewards, dones = env.step(actions)   # actions: int array (N,)
+
+Ações: 0 mantém a direção, 1 cima, 2 baixo, 3 esquerda, 4 direita.
+Ambientes que terminam (Nemo capturado) são reiniciados automaticamente; o
+done daquele passo vem True e a observação já é do novo episódio.
+"""
+
+import random
+
+import numpy as np
+
+from headless import load_game_module
+
+ACTION_NOOP = 0
+NUM_ACTIONS = 5
+
+# Recompensas por step
+SURVIVAL_REWARD = 0.01
+HEALTH_REWARD_SCALE = 1 / 100  # Cada ponto de saúde perdido/ganho
+DEATH_REWARD = -1.0
+
+# Canais da grade de ocupação
+CHANNEL_SEAWEED = 0
+CHANNEL_SHARKS = 1
+CHANNEL_BUBBLES = 2
+CHANNEL_HERO = 3
+NUM_CHANNELS = 4
+
+
+class SilentSoundManager:
+    """Substitui o SoundManager: as simulações não tocam nada"""
+
+    music_enabled = False
+    sounds_enabled = False
+
+    def play_background_music(self):
+        pass
+
+    def play_swim_sound(self):
+        pass
+
+    def play_bubble_collect(self):
+        pass
+
+    def play_shark_bite(self):
+        pass
+
+    def play_menu_select(self):
+        pass
+
+    def play_game_over(self):
+        pass
+
+    def play_ambient_bubbles(self):
+        pass
+
+
+class OceanVectorEnv:
+    """Avança `num_envs` partidas em sincronia e devolve arrays NumPy empilhados"""
+
+    def __init__(self, num_envs, seed=0, frame_skip=4, dt=1 / 60):
+        self.main = load_game_module()
+
+        self.num_envs = num_envs
+        self.frame_skip = frame_skip
+        self.dt = dt
+
+        main = self.main
+        self.grid_shape = (main.GRID_HEIGHT, main.GRID_WIDTH)
+        self.action_directions = (None,) + main.DIRECTIONS
+
+        # Cada oceano tem seu próprio gerador e contador global
+        self.rngs = [random.Random(seed + index) for index in range(num_envs)]
+        self.timers = [0.0] * num_envs
+        self.games = [None] * num_envs
+        self.seaweed_grids = np.zeros((num_envs,) + self.grid_shape, dtype=np.uint8)
+
+        for index in range(num_envs):
+            with self.env_context(index):
+                self.games[index] = main.Game(sprites_enabled=False)
+                self.games[index].sound_manager = SilentSoundManager()
+                self.start_episode(index)
+
+        self.max_sharks = self.games[0].max_enemies
+
+    def env_context(self, index):
+        return _EnvContext(self, index)
+
+    def start_episode(self, index):
+        """Novo fundo do oceano e nova partida (chamado dentro de env_context)"""
+        game = self.games[index]
+        game.dungeon = self.main.Dungeon(game.sprites_enabled)
+        game.reset_game()
+        game.state = self.main.GAME_STATE_PLAYING
+
+        grid = self.seaweed_grids[index]
+        grid[:] = 0
+        for x, y in game.dungeon.seaweed:
+            grid[y, x] = 1
+
+    def reset(self):
+        for index in range(self.num_envs):
+            with self.env_context(index):
+                self.start_episode(index)
+        return self.observe()
+
+    def step(self, actions):
+        """Aplica uma ação por oceano e avança frame_skip quadros
+
+        Retorna (observações, recompensas float32 (N,), dones bool (N,)).
+        """
+        actions = np.asarray(actions)
+
+        # Valida antes de avançar qualquer oceano, para não tirar o lote de sincronia
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"Esperado um array de ações com forma ({self.num_envs},), "
+                             f"recebido {actions.shape}")
+        if not np.issubdtype(actions.dtype, np.integer):
+            raise ValueError(f"As ações devem ser inteiras, recebido {actions.dtype}")
+        if ((actions < 0) | (actions >= NUM_ACTIONS)).any():
+            raise ValueError(f"As ações devem estar entre 0 e {NUM_ACTIONS - 1}")
+
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        game_over = self.main.GAME_STATE_GAME_OVER
+
+        for index, game in enumerate(self.games):
+            with self.env_context(index):
+                direction = self.action_directions[actions[index]]
+                if direction:
+                    game.hero.change_direction(direction)
+
+                health_before = game.hero.health
+                for _ in range(self.frame_skip):
+                    game.update_game(self.dt)
+                    if game.state == game_over:
+                        break
+
+                rewards[index] = (SURVIVAL_REWARD +
+                                  (game.hero.health - health_before) * HEALTH_REWARD_SCALE)
+                if game.state == game_over:
+                    rewards[index] += DEATH_REWARD
+                    dones[index] = True
+                    self.start_episode(index)
+
+        return self.observe(), rewards, dones
+
+    def observe(self):
+        """Observações empilhadas de todos os oceanos
+
+        grid: uint8 (N, 4, altura, largura) com algas, tubarões (contagem),
+              bolhas e Nemo
+        health: float32 (N,)
+        shark_positions: float32 (N, max_sharks, 2) em células (x, y), com zeros
+        shark_mask: bool (N, max_sharks) indicando as posições válidas
+        """
+        grid = np.zeros((self.num_envs, NUM_CHANNELS) + self.grid_shape, dtype=np.uint8)
+        grid[:, CHANNEL_SEAWEED] = self.seaweed_grids
+        health = np.empty(self.num_envs, dtype=np.float32)
+        shark_positions = np.zeros((self.num_envs, self.max_sharks, 2), dtype=np.float32)
+        shark_mask = np.zeros((self.num_envs, self.max_sharks), dtype=bool)
+        grid_size = self.main.GRID_SIZE
+
+        for index, game in enumerate(self.games):
+            hero = game.hero
+            health[index] = hero.health
+            grid[index, CHANNEL_HERO, hero.grid_y, hero.grid_x] = 1
+
+            for powerup in game.health_powerups:
+                grid[index, CHANNEL_BUBBLES, powerup.grid_y, powerup.grid_x] = 1
+
+            enemies = game.enemies[:self.max_sharks]
+            if enemies:
+                cells = np.array([(enemy.grid_y, enemy.grid_x) for enemy in enemies])
+                np.add.at(grid[index, CHANNEL_SHARKS], (cells[:, 0], cells[:, 1]), 1)
+                shark_positions[index, :len(enemies)] = [
+                    (enemy.real_x / grid_size, enemy.real_y / grid_size) for enemy in enemies
+                ]
+                shark_mask[index, :len(enemies)] = True
+
+        return {
+            'grid': grid,
+            'health': health,
+            'shark_positions': shark_positions,
+            'shark_mask': shark_mask,
+        }
+
+
+class _EnvContext:
+    """Troca o gerador aleatório e o contador global do jogo pelos do oceano `index`
+
+    main.py usa as funções do módulo random (random.randint, random.choice...);
+    um random.Random tem os mesmos métodos, então basta trocar o nome `random`
+    dentro do módulo do jogo enquanto aquele oceano é atualizado. Na saída os
+    valores anteriores voltam, então o jogo (ou outro ambiente) no mesmo
+    processo não é afetado.
+    """
+
+    def __init__(self, env, index):
+        self.env = env
+        self.index = index
+        self.saved_random = None
+        self.saved_timer = None
+
+    def __enter__(self):
+        main = self.env.main
+        self.saved_random = main.random
+        self.saved_timer = main.global_timer
+        main.random = self.env.rngs[self.index]
+        main.global_timer = self.env.timers[self.index]
+
+    def __exit__(self, *exc_info):
+        main = self.env.main
+        self.env.timers[self.index] = main.global_timer
+        main.random = self.saved_random
+        main.global_timer = self.saved_timer